@@ -1,27 +1,46 @@
 import re
-import json
-from dataclasses import dataclass, asdict
+import sys
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Tuple
 
+import numpy as np
+import orjson
 import requests
-from bs4 import BeautifulSoup, Tag
-
-
-@dataclass
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer, Tag
+
+# Prefer lxml (C parser, ~10x faster than html.parser); fall back if not installed.
+try:
+    BeautifulSoup("", "lxml")
+    BS4_PARSER = "lxml"
+except FeatureNotFound:
+    BS4_PARSER = "html.parser"
+
+# The match parsers only look at content tags; straining at tokenization time
+# keeps <head>, meta and top-level script/style noise out of the tree. Kept as
+# a tag whitelist (no class filter) because the markup classes are unknown —
+# tighten once the real HTML is inspected.
+MATCH_STRAINER = SoupStrainer(
+    ["title", "h1", "h2", "h3", "h4", "a", "img", "div", "section", "span",
+     "ul", "li", "strong", "p", "table", "tbody", "tr", "td", "th"]
+)
+
+
+@dataclass(slots=True)
 class GoalEvent:
     team: str
     player: str
     minute: int
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerEvent:
     minute: int
     raw: str  # raw text like "60'" – type (card/sub) may need extra logic
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerInfo:
     name: str
     shirt_number: Optional[int]
@@ -31,7 +50,7 @@ class PlayerInfo:
     events: List[PlayerEvent]
 
 
-@dataclass
+@dataclass(slots=True)
 class MatchData:
     url: str
     competition: Optional[str]
@@ -44,16 +63,44 @@ class MatchData:
     date_time: Optional[datetime]
     goals: List[GoalEvent]
     lineups: Dict[str, List[PlayerInfo]]  # team -> players list
+    # Struct-of-arrays mirror of `goals` (keys: minute/player/team) for
+    # vectorized aggregation downstream, e.g.
+    # np.unique(goals_soa["team"], return_counts=True)
+    goals_soa: Dict[str, Any] = field(default_factory=dict)
 
 
-GOAL_MINUTE_RE = re.compile(r"(\d+)'")
 DATETIME_RE = re.compile(r"(\d{2}\.\d{2}\.\d{4}\.)\s+(\d{2}:\d{2})")
+# Compiled patterns for marker-text lookups: BS4 matches these at C level,
+# unlike string=lambda which calls back into Python for every text node.
+SUCI_RE = re.compile(r"Suci:")
+BENCH_RE = re.compile(r"Pričuvni igrači")
+
+
+def _parse_minute(token: str) -> int:
+    """
+    Fast path for minute tokens like "45'": return the minute, or -1 if the
+    token is not one. This runs for every candidate string in the goals block
+    and every player card, where firing up the regex engine for a three-char
+    pattern is pure overhead — endswith/isdigit are single C calls.
+    """
+    if len(token) >= 2 and token.endswith("'") and token[:-1].isdigit():
+        return int(token[:-1])
+    return -1
+
 
+def _fetch(url: str) -> bytes:
+    # Stream the body and return raw bytes: decoding happens once inside lxml
+    # instead of building a full decoded str copy via resp.text.
+    buf = bytearray()
+    with requests.get(url, stream=True) as resp:
+        resp.raise_for_status()
+        for chunk in resp.iter_content(chunk_size=65536):
+            buf += chunk
+    return bytes(buf)
 
-def _get_soup(url: str) -> BeautifulSoup:
-    resp = requests.get(url)
-    resp.raise_for_status()
-    return BeautifulSoup(resp.text, "html.parser")
+
+def _soup_from(html) -> BeautifulSoup:
+    return BeautifulSoup(html, BS4_PARSER, parse_only=MATCH_STRAINER)
 
 
 def _parse_header_info(soup: BeautifulSoup):
@@ -65,11 +112,17 @@ def _parse_header_info(soup: BeautifulSoup):
     title = " ".join(h1.get_text(" ", strip=True).split())
     # Expected shape:
     # "NK Hajduk 1932 - NK Croatia Gabrili 4:3, 1. ŽNL 25/26"
-    m = re.match(r"(.+?)\s*-\s*(.+?)\s+(\d+):(\d+),\s*(.+)", title)
-    if not m:
+    # Split with C-level str partitions instead of a backtracking regex:
+    # competition sits after the last ", ", the score is the last token
+    # before it, and the teams surround the first " - ".
+    head, comp_sep, competition = title.rpartition(", ")
+    teams_part, _, score = head.rpartition(" ")
+    home_score, colon, away_score = score.partition(":")
+    home_team, team_sep, away_team = teams_part.partition(" - ")
+    if not (comp_sep and colon and team_sep
+            and home_score.isdigit() and away_score.isdigit()):
         raise RuntimeError(f"Unexpected match title format: {title!r}")
 
-    home_team, away_team, home_score, away_score, competition = m.groups()
     return {
         "home_team": home_team.strip(),
         "away_team": away_team.strip(),
@@ -131,31 +184,25 @@ def _parse_goals_block(soup: BeautifulSoup, teams: Dict[str, str]) -> List[GoalE
     goals: List[GoalEvent] = []
 
     # Find the node containing 'Suci:' (referees)
-    referees_node = soup.find(string=lambda t: isinstance(t, str) and "Suci:" in t)
+    referees_node = soup.find(string=SUCI_RE)
     if not referees_node:
         return goals
 
-    # The goals list is shortly after that element. We'll walk forward
-    current = referees_node.parent
-    # Collect a small number of following strings to keep things safe
-    candidates: List[str] = []
-    seen = 0
-
-    while current and seen < 120:  # arbitrary safety limit
-        for t in current.stripped_strings:
-            candidates.append(t)
-        current = current.next_sibling if isinstance(current, Tag) else current.parent.next_sibling
-        seen += 1
+    # The goals list is shortly after that element. Grab the following text
+    # nodes in one linear pass rather than crawling siblings and re-entering
+    # each subtree via stripped_strings (which double-counted text).
+    following = referees_node.find_all_next(string=True, limit=512)
+    candidates: List[str] = [s for s in (t.strip() for t in following) if s]
 
     # Now parse candidate strings into (name, minute) pairs
     last_name: Optional[str] = None
     for token in candidates:
-        m = GOAL_MINUTE_RE.fullmatch(token)
-        if m and last_name:
-            minute = int(m.group(1))
-            goals.append(GoalEvent(team="", player=last_name, minute=minute))
-            last_name = None
-        elif not GOAL_MINUTE_RE.fullmatch(token) and not token.startswith("Suci"):
+        minute = _parse_minute(token)
+        if minute >= 0:
+            if last_name:
+                goals.append(GoalEvent(team="", player=last_name, minute=minute))
+                last_name = None
+        elif not token.startswith("Suci"):
             # Very naive: treat as name if it's not just a minute
             last_name = token
 
@@ -193,7 +240,7 @@ def _iterate_team_blocks(soup: BeautifulSoup) -> List[Tag]:
     team_blocks: List[Tag] = []
 
     for team_name in (home_name, away_name):
-        node = soup.find(string=lambda t: isinstance(t, str) and t.strip() == team_name)
+        node = soup.find(string=re.compile(rf"^\s*{re.escape(team_name)}\s*$"))
         if not node:
             continue
         # We'll take the parent container as the team block root
@@ -203,10 +250,15 @@ def _iterate_team_blocks(soup: BeautifulSoup) -> List[Tag]:
     return team_blocks
 
 
-def _parse_players_from_team_block(team_block: Tag) -> List[PlayerInfo]:
+def _parse_players_from_team_block(
+    team_block: Tag, team_name: str, player_to_team: Dict[str, str]
+) -> List[PlayerInfo]:
     """
     Parse players for one team from the corresponding DOM block.
 
+    Each parsed player is also recorded in `player_to_team`, so goal events
+    can be attributed to a team afterwards without re-walking the lineups.
+
     From the rendered text we know each player appears roughly like:
 
         <img ...>
@@ -220,21 +272,51 @@ def _parse_players_from_team_block(team_block: Tag) -> List[PlayerInfo]:
     """
     players: List[PlayerInfo] = []
 
-    for h3 in team_block.find_all("h3"):
+    all_h3 = team_block.find_all("h3")
+
+    # One flattened pass over the block collects everything the per-player
+    # loop needs: the position of the "Pričuvni igrači" divider, the position
+    # of each <h3>, and every non-empty text node with its position. Event
+    # extraction then becomes slicing this list between consecutive <h3>s,
+    # instead of a next_siblings + stripped_strings crawl per player.
+    bench_marker = team_block.find(string=BENCH_RE)
+    bench_pos: Optional[int] = None
+    h3_pos: Dict[int, int] = {}
+    texts: List[Tuple[int, str]] = []
+    for i, el in enumerate(team_block.descendants):
+        if el is bench_marker:
+            bench_pos = i
+        elif isinstance(el, Tag):
+            if el.name == "h3":
+                h3_pos[id(el)] = i
+        else:
+            stripped = el.strip()
+            if stripped:
+                texts.append((i, stripped))
+    text_positions = [pos for pos, _ in texts]
+    # h3 document positions in order, for "until the next player card" bounds
+    h3_bounds = sorted(h3_pos.values())
+
+    for card_idx, h3 in enumerate(all_h3):
         name_text = h3.get_text(" ", strip=True)
 
         is_captain = "(C)" in name_text
-        name_text = name_text.replace("(C)", "").strip()
+        # Interned: names recur across goals/lineups and key dict lookups.
+        name_text = sys.intern(name_text.replace("(C)", "").strip())
+
+        start = h3_pos.get(id(h3))
 
-        # Shirt number often appears close to player card, e.g. in a sibling with a small integer.
+        # Shirt number often appears close to player card, e.g. in a sibling
+        # with a small integer. Check the (at most) three text nodes before
+        # this h3 in the precomputed vector rather than doing a
+        # find_all_previous document walk per player.
         shirt_number = None
-        # Look backward a bit for a small integer
-        prev_texts = list(h3.find_all_previous(string=True, limit=3))
-        for t in reversed(prev_texts):
-            t = t.strip()
-            if t.isdigit():
-                shirt_number = int(t)
-                break
+        if start is not None:
+            idx = bisect_left(text_positions, start)
+            for _, t in texts[max(0, idx - 3):idx]:
+                if t.isdigit():
+                    shirt_number = int(t)
+                    break
 
         # Position is often in the next tag (Vratar / Igrač)
         position = None
@@ -244,30 +326,26 @@ def _parse_players_from_team_block(team_block: Tag) -> List[PlayerInfo]:
         if isinstance(nxt, Tag):
             pos_text = nxt.get_text(" ", strip=True)
             if pos_text:
-                position = pos_text
+                # "Vratar"/"Igrač" repeat for every player; share one object
+                position = sys.intern(pos_text)
 
-        # Player events: minutes like "60'", "85'", etc appearing after h3
+        # Player events: minutes like "60'", "85'", etc appearing between this
+        # h3 and the next player card (or the end of the team block).
         events: List[PlayerEvent] = []
-        scan_node = h3
-        # Scan forward until the next h3 (next player card) or end of this team block
-        for sib in h3.next_siblings:
-            if isinstance(sib, Tag) and sib.name == "h3":
-                break  # next player
-            if isinstance(sib, Tag):
-                for t in sib.stripped_strings:
-                    m = GOAL_MINUTE_RE.fullmatch(t)
-                    if m:
-                        events.append(PlayerEvent(minute=int(m.group(1)), raw=t))
-
-        # Determine if starting or on bench heuristically:
-        # There is a "Pričuvni igrači" heading between starters and bench players.
-        is_starting = True
-        bench_marker = team_block.find(string=lambda t: isinstance(t, str) and "Pričuvni igrači" in t)
-        if bench_marker and bench_marker.parent and bench_marker.parent.find_all("h3"):
-            # If this player's h3 comes after bench_marker in document order, mark as bench
-            if bench_marker.parent in h3.find_all_previous():
-                is_starting = False
-
+        if start is not None:
+            end = h3_bounds[card_idx + 1] if card_idx + 1 < len(h3_bounds) else None
+            lo = bisect_right(text_positions, start)
+            hi = bisect_left(text_positions, end) if end is not None else len(texts)
+            for _, t in texts[lo:hi]:
+                minute = _parse_minute(t)
+                if minute >= 0:
+                    events.append(PlayerEvent(minute=minute, raw=t))
+
+        # Starting if this h3 comes before the bench divider in document order
+        # (or there is no divider at all).
+        is_starting = bench_pos is None or h3_pos.get(id(h3), 0) < bench_pos
+
+        player_to_team[name_text] = team_name
         players.append(
             PlayerInfo(
                 name=name_text,
@@ -282,23 +360,16 @@ def _parse_players_from_team_block(team_block: Tag) -> List[PlayerInfo]:
     return players
 
 
-def _attach_goal_teams(goals: List[GoalEvent], lineups: Dict[str, List[PlayerInfo]]):
-    """Using lineups, assign each goal to a team."""
-    # Build map player_name -> team
-    player_to_team: Dict[str, str] = {}
-    for team, plist in lineups.items():
-        for p in plist:
-            player_to_team.setdefault(p.name, team)
-
+def _attach_goal_teams(goals: List[GoalEvent], player_to_team: Dict[str, str]):
+    """Assign each goal to a team using the map built during lineup parsing."""
     for g in goals:
-        if g.player in player_to_team:
-            g.team = player_to_team[g.player]
-        else:
-            g.team = "Unknown"
+        g.team = sys.intern(player_to_team.get(g.player, "Unknown"))
 
 
-def scrape_match(url: str) -> MatchData:
-    soup = _get_soup(url)
+def parse_match(html, url: str) -> MatchData:
+    """Parse an already-fetched match page (str or bytes). Split out from
+    scrape_match so async/batch drivers can fetch pages their own way."""
+    soup = _soup_from(html)
 
     header = _parse_header_info(soup)
     venue, city, dt = _parse_datetime_and_venue(soup)
@@ -314,15 +385,31 @@ def scrape_match(url: str) -> MatchData:
         header["away_team"]: [],
     }
 
-    print(f"Home team block: {team_blocks[0]}")
+    # Filled in while parsing lineups; used to attribute goals to teams.
+    player_to_team: Dict[str, str] = {}
+
     # Heuristic: first block -> home, second -> away
     if len(team_blocks) >= 1:
-        lineups[header["home_team"]] = _parse_players_from_team_block(team_blocks[0])
+        lineups[header["home_team"]] = _parse_players_from_team_block(
+            team_blocks[0], header["home_team"], player_to_team
+        )
     if len(team_blocks) >= 2:
-        lineups[header["away_team"]] = _parse_players_from_team_block(team_blocks[1])
+        lineups[header["away_team"]] = _parse_players_from_team_block(
+            team_blocks[1], header["away_team"], player_to_team
+        )
 
     # Attach teams to goals
-    _attach_goal_teams(goals, lineups)
+    _attach_goal_teams(goals, player_to_team)
+
+    # Column-oriented view of the goals: analytics (goals per team, goals per
+    # minute bucket) run over these arrays at C speed instead of iterating
+    # dataclass attributes.
+    goals_soa = {
+        "minute": np.fromiter((g.minute for g in goals), dtype=np.int16,
+                              count=len(goals)),
+        "player": np.array([g.player for g in goals], dtype=object),
+        "team": np.array([g.team for g in goals], dtype=object),
+    }
 
     # TODO (once you inspect raw HTML):
     #   - add _parse_cards(soup) to detect yellow/red based on icon CSS classes
@@ -341,19 +428,29 @@ def scrape_match(url: str) -> MatchData:
         date_time=dt,
         goals=goals,
         lineups=lineups,
+        goals_soa=goals_soa,
     )
 
 
+def scrape_match(url: str) -> MatchData:
+    return parse_match(_fetch(url), url)
+
+
 if __name__ == "__main__":
     test_url = "https://semafor.hns.family/utakmice/101386217/nk-orebic-onk-metkovic-4-5/"
     data = scrape_match(test_url)
 
-    # Pretty-print as JSON
-    def serialize(obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        if hasattr(obj, "__dict__"):
-            return asdict(obj)
+    # Pretty-print as JSON. orjson walks dataclasses, datetimes and numeric
+    # numpy arrays natively (in Rust); only the object-dtype name/team arrays
+    # need the tolist fallback.
+    def _default(obj):
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
         raise TypeError(f"Type not serializable: {type(obj)}")
 
-    print(json.dumps(asdict(data), default=serialize, ensure_ascii=False, indent=2))
+    sys.stdout.buffer.write(orjson.dumps(
+        data,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+        default=_default,
+    ))
+    sys.stdout.buffer.write(b"\n")
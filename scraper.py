@@ -2,7 +2,7 @@
 scrapers/hns_semafor.py
 
 Dependencies:
-  pip install requests beautifulsoup4 python-dateutil
+  pip install requests selectolax python-dateutil
 
 Usage pattern:
   from scrapers.hns_semafor import CompetitionScraper
@@ -10,15 +10,99 @@ Usage pattern:
   data = scraper.scrape_all()
 """
 
+import asyncio
 import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
 from urllib.parse import urljoin
 
+import httpx
 import requests
-from bs4 import BeautifulSoup
 from dateutil import parser as dateparser
+from selectolax.parser import HTMLParser
+
+from demo_scraper import parse_match, scrape_match
 
 USER_AGENT = "FantasyScraper/1.0 (+https://yourdomain.example)"
 
+# Compiled once at import time; these run inside per-node/per-row loops where
+# repeated re.compile cache lookups add up.
+_SEASON_RE = re.compile(r"\d{4}/\d{4}")
+_DATE_RE = re.compile(r"\d{2}\.\d{2}\.\d{4}\.?")
+_DATE_TIME_RE = re.compile(r"(\d{2})\.(\d{2})\.(\d{4})\.?(?:\s+(\d{2}):(\d{2}))?")
+_SCORE_RE = re.compile(r"(\d+)\s*:\s*(\d+)")
+_TEAM_ANCHOR_RE = re.compile(r"/klub|^(?:NK|HNK|ONK|BŠK|GNK)\b", re.I)
+_KLUB_PREFIX_RE = re.compile(r"^(NK|HNK|ONK|BŠK|GNK)\b")
+_KLUB_HREF_RE = re.compile(r"/klub/(\d+)")
+_NUM_RE = re.compile(r"\b\d+\b")
+_STATS_HEADING_RES = {
+    h: re.compile(re.escape(h))
+    for h in ("Strijelci", "Kartoni", "Nastupi / minute", "Strijelci, kartoni")
+}
+
+
+@lru_cache(maxsize=512)
+def _http_get(session, url):
+    """
+    Streamed GET memoized on (session, url), so pages reached from several
+    parsers (team pages linked from standings and fixtures, say) are fetched
+    once per crawl. Sessions hash by identity, so each scraper instance gets
+    its own cache entries.
+    """
+    buf = bytearray()
+    with session.get(url, stream=True) as r:
+        r.raise_for_status()
+        for chunk in r.iter_content(chunk_size=65536):
+            buf += chunk
+    return bytes(buf)
+
+
+@lru_cache(maxsize=64)
+def _tree_for(session, url):
+    """Parsed-tree cache on top of _http_get. Treat the returned tree as
+    read-only: it is shared between callers."""
+    return HTMLParser(_http_get(session, url))
+
+
+def _iter_text_nodes(root, pattern):
+    """Yield text nodes under `root` whose content matches a compiled regex."""
+    for node in root.traverse(include_text=True):
+        if node.tag == "-text":
+            t = node.text_content
+            if t and pattern.search(t):
+                yield node
+
+
+def _find_text_node(root, pattern):
+    """First text node under `root` matching `pattern`, or None."""
+    return next(_iter_text_nodes(root, pattern), None)
+
+
+async def _scrape_one_async(client, loop, url):
+    r = await client.get(url)
+    r.raise_for_status()
+    # Parse off the event loop; lxml releases the GIL while tokenizing, so
+    # parses overlap with the remaining fetches.
+    return await loop.run_in_executor(None, parse_match, r.content, url)
+
+
+async def scrape_matches_async(urls, max_connections=20):
+    """
+    Fetch all match pages concurrently over one HTTP/2 connection pool and
+    parse each as soon as its body arrives. Total crawl time approaches
+    max(network, parse) instead of their sum; results keep input order.
+    """
+    loop = asyncio.get_running_loop()
+    limits = httpx.Limits(max_keepalive_connections=max_connections)
+    async with httpx.AsyncClient(
+        http2=True, limits=limits, headers={"User-Agent": USER_AGENT}
+    ) as client:
+        return list(await asyncio.gather(
+            *(_scrape_one_async(client, loop, url) for url in urls)
+        ))
+
+
 class CompetitionScraper:
     def __init__(self, competition_url, session=None):
         self.base_url = competition_url
@@ -26,13 +110,20 @@ class CompetitionScraper:
         self.session.headers.update({"User-Agent": USER_AGENT})
 
     def fetch(self, url):
-        r = self.session.get(url)
-        r.raise_for_status()
-        return r.text
+        # Stream the body in chunks and return raw bytes: the parser handles
+        # decoding itself, so this skips requests' full-document .text str
+        # copy and roughly halves peak memory on large pages.
+        return _http_get(self.session, url)
 
     def soup(self, url):
-        html = self.fetch(url)
-        return BeautifulSoup(html, "html.parser")
+        """Fetch and parse a page into a selectolax tree (name kept from the
+        BS4 days for call-site compatibility)."""
+        return _tree_for(self.session, url)
+
+    def invalidate(self):
+        """Drop cached pages and trees, e.g. before re-polling live scores."""
+        _http_get.cache_clear()
+        _tree_for.cache_clear()
 
     def scrape_all(self):
         soup = self.soup(self.base_url)
@@ -49,18 +140,30 @@ class CompetitionScraper:
             "player_stats": player_stats,
         }
 
+    def scrape_matches(self, urls, max_workers=16):
+        """
+        Scrape many match pages concurrently. The per-match work is dominated
+        by the HTTP round-trip, so a thread pool gives near-linear speedup up
+        to the worker count. Results come back in the same order as `urls`.
+        For large fixture lists prefer the module-level scrape_matches_async,
+        which multiplexes all pages over one HTTP/2 connection.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            return list(ex.map(scrape_match, urls))
+
     def parse_competition_meta(self, soup):
         # Example: page shows a H1 or heading with competition name and season
-        title = soup.find("h1")
+        title = soup.css_first("h1")
         if title:
-            name = title.get_text(strip=True)
+            name = title.text(strip=True)
         else:
-            name = soup.title.string if soup.title else self.base_url
+            title_tag = soup.css_first("title")
+            name = title_tag.text(strip=True) if title_tag else self.base_url
         # Try to find season label text nearby
         season_text = None
-        season_elem = soup.find(text=re.compile(r"\d{4}/\d{4}"))
+        season_elem = _find_text_node(soup.root, _SEASON_RE)
         if season_elem:
-            season_text = season_elem.strip()
+            season_text = season_elem.text_content.strip()
         return {"name": name, "season_label": season_text, "url": self.base_url}
 
     def parse_teams(self, soup):
@@ -69,28 +172,35 @@ class CompetitionScraper:
         We'll collect href, name and image if present.
         """
         teams = {}
-        # find anchors that look like team links - heuristic: href contains '/klub' or link text looks like uppercase name or ends with team
-        anchors = soup.find_all("a", href=True)
+        # team links point to klub pages; one CSS selector filters them in the
+        # C selector engine instead of regex-testing every anchor on the page
+        anchors = soup.css('a[href*="/klub"]')
+        if not anchors:
+            # heuristic fallback: link text looks like a club name ("NK", "HNK", ...)
+            anchors = [
+                a for a in soup.css("a[href]")
+                if _TEAM_ANCHOR_RE.search(a.text(separator=" ", strip=True))
+            ]
         for a in anchors:
-            href = a['href']
-            text = a.get_text(" ", strip=True)
-            if not text:
+            href = a.attributes.get("href")
+            text = a.text(separator=" ", strip=True)
+            if not href or not text:
                 continue
-            # heuristics: team links often point to klub pages or include "NK", "HNK", "ONK", "BŠK", etc.
-            if re.search(r"/klub|^NK |^HNK |^ONK |^BŠK |^GNK |^NK ", text, re.I) or re.search(r"/klub", href):
-                full_href = urljoin(self.base_url, href)
-                # get image if inside link
-                img = a.find("img")
-                img_src = urljoin(self.base_url, img["src"]) if img and img.get("src") else None
-                hns_id_match = re.search(r"/klub/(\d+)", href)
-                hns_id = hns_id_match.group(1) if hns_id_match else href
-                teams[text] = {"name": text, "url": full_href, "crest": img_src, "hns_id": hns_id}
+            full_href = urljoin(self.base_url, href)
+            # get image if inside link
+            img = a.css_first("img")
+            img_src = None
+            if img and img.attributes.get("src"):
+                img_src = urljoin(self.base_url, img.attributes["src"])
+            hns_id_match = _KLUB_HREF_RE.search(href)
+            hns_id = hns_id_match.group(1) if hns_id_match else href
+            teams[text] = {"name": text, "url": full_href, "crest": img_src, "hns_id": hns_id}
         # fallback: sometimes teams are listed as list items with class 'team' - try to find unique team names in page
         if not teams:
             candidate_texts = set()
-            for tag in soup.select("div, li, span"):
-                txt = tag.get_text(" ", strip=True)
-                if re.match(r"^(NK|HNK|ONK|BŠK|GNK)\b", txt):
+            for tag in soup.css("div, li, span"):
+                txt = tag.text(separator=" ", strip=True)
+                if _KLUB_PREFIX_RE.match(txt):
                     candidate_texts.add(txt)
             for t in candidate_texts:
                 teams[t] = {"name": t, "url": None, "crest": None, "hns_id": None}
@@ -106,52 +216,46 @@ class CompetitionScraper:
         # The page uses "Raspored, rezultati, strijelci" and then rounds like "* 1. kolo" and list of matches.
         # Find blocks that look like fixtures: date (like 28.09.2025.) and subsequent links with scores.
         # We'll search for patterns of date text followed by siblings containing anchors and score text.
-        # Find any element that contains a date pattern
-        date_nodes = soup.find_all(text=re.compile(r"\d{2}\.\d{2}\.\d{4}\.?"))
-        seen = set()
-        for node in date_nodes:
-            parent = node.parent
-            # Walk siblings to find match entries within the same parent or next ul
-            block = parent
-            # collect nearby anchors that likely represent teams and score spans
-            # We search following elements in parent's next siblings up to N nodes
-            current = block
-            for sib in list(current.next_siblings)[:40]:
-                text = getattr(sib, "get_text", lambda **k: "")(strip=True)
+        for node in _iter_text_nodes(soup.root, _DATE_RE):
+            # Walk the parent's following siblings (up to 40 hops) to find
+            # match entries belonging to this date heading.
+            sib = node.parent.next if node.parent else None
+            hops = 0
+            while sib is not None and hops < 40:
+                hops += 1
+                if sib.tag == "-text":
+                    sib = sib.next
+                    continue
+                sib_text = sib.text(separator=" ", strip=True)
                 # if it contains a team anchor + score pattern, try to extract
-                anchors = sib.find_all("a") if hasattr(sib, "find_all") else []
-                if len(anchors) >= 2 and re.search(r"\d+\s*:\s*\d+", sib.get_text(" ", strip=True)):
+                anchors = sib.css("a")
+                score_match = _SCORE_RE.search(sib_text) if len(anchors) >= 2 else None
+                if score_match:
                     # extract teams and score
-                    a_texts = [a.get_text(" ", strip=True) for a in anchors[:2]]
-                    score_match = re.search(r"(\d+)\s*:\s*(\d+)", sib.get_text(" ", strip=True))
-                    home_goals = int(score_match.group(1)) if score_match else None
-                    away_goals = int(score_match.group(2)) if score_match else None
-                    # look for venue in same block
-                    venue = None
-                    v = sib.find_next(string=re.compile(r"[A-Za-z0-9ČĆŽŠĐčćžšđ ,\-]+"))
+                    a_texts = [a.text(separator=" ", strip=True) for a in anchors[:2]]
                     # attempt to parse date + time from original date node text
-                    dt = self._parse_datetime_from_context(node)
+                    dt = self._parse_datetime_from_context(node.text_content)
                     fixtures.append({
                         "date": dt,
                         "home": a_texts[0],
                         "away": a_texts[1],
-                        "home_goals": home_goals,
-                        "away_goals": away_goals,
-                        "venue": venue,
+                        "home_goals": int(score_match.group(1)),
+                        "away_goals": int(score_match.group(2)),
+                        "venue": None,
                         "match_url": None
                     })
                 # stop if a new date or round appears
-                if re.search(r"\d{2}\.\d{2}\.\d{4}\.", getattr(sib, "get_text", lambda **k: "")()):
+                if _DATE_RE.search(sib_text):
                     break
+                sib = sib.next
         # As a fallback: search for any score patterns and pick surrounding anchors as teams
         if not fixtures:
-            all_nodes = soup.find_all(string=re.compile(r"\d+\s*:\s*\d+"))
-            for node in all_nodes:
+            for node in _iter_text_nodes(soup.root, _SCORE_RE):
                 parent = node.parent
-                anchors = parent.find_all("a")
+                anchors = parent.css("a") if parent else []
                 if len(anchors) >= 2:
-                    a_texts = [a.get_text(strip=True) for a in anchors[:2]]
-                    score_match = re.search(r"(\d+)\s*:\s*(\d+)", node)
+                    a_texts = [a.text(strip=True) for a in anchors[:2]]
+                    score_match = _SCORE_RE.search(node.text_content)
                     fixtures.append({
                         "date": None,
                         "home": a_texts[0],
@@ -163,19 +267,22 @@ class CompetitionScraper:
                     })
         return fixtures
 
-    def _parse_datetime_from_context(self, text_node):
-        txt = text_node.strip()
-        # The page uses format "28.09.2025. 16:00" or "28.09.2025."
+    def _parse_datetime_from_context(self, txt):
+        txt = txt.strip()
+        # The page uses format "28.09.2025. 16:00" or "28.09.2025." — build
+        # the datetime straight from the matched digits; dateutil's fuzzy
+        # parser only runs for anything that doesn't fit.
+        m = _DATE_TIME_RE.search(txt)
+        if m:
+            day, month, year, hour, minute = m.groups()
+            try:
+                return datetime(int(year), int(month), int(day),
+                                int(hour or 0), int(minute or 0))
+            except ValueError:
+                pass  # out-of-range digits; fall through to fuzzy parsing
         try:
-            # replace dots to conform to parseable format
-            # ensure trailing time exists
-            dt_txt = re.sub(r"\.", "", txt).strip()
-            # common pattern dd.mm.YYYY HH:MM
-            # replace dot-space with space
             dt_txt = txt.replace(".", "").strip()
-            # Try parsing
-            dt = dateparser.parse(dt_txt, dayfirst=True, fuzzy=True)
-            return dt
+            return dateparser.parse(dt_txt, dayfirst=True, fuzzy=True)
         except Exception:
             return None
 
@@ -183,44 +290,38 @@ class CompetitionScraper:
         """
         Parse standings table if present. Returns list of dicts per row.
         """
-        tables = soup.find_all("table")
         standings = []
-        for table in tables:
+        for table in soup.css("table"):
             # Heuristic: table headers with 'Poz.', 'Klub', 'B', 'W', 'D', 'L', 'B.', 'Gol razlika', or 'Bodovi'
-            headers = [th.get_text(strip=True).lower() for th in table.find_all("th")]
+            headers = [th.text(strip=True).lower() for th in table.css("th")]
             if any(h in " ".join(headers) for h in ("poz", "klub", "bod")):
                 # parse rows
-                for tr in table.select("tbody tr"):
-                    tds = [td.get_text(" ", strip=True) for td in tr.find_all("td")]
-                    if not tds:
+                # expected columns: [pos, team, played, wins, draws, losses, gf, ga, ..., pts]
+                for tr in table.css("tbody tr"):
+                    tds = [td.text(separator=" ", strip=True) for td in tr.css("td")]
+                    if len(tds) < 3 or not tds[0].isdigit():
                         continue
-                    # attempt to map columns: [pos, team, played, wins, draws, losses, gf-ga, gd, pts]
-                    try:
-                        pos = int(tds[0])
-                        team_name = None
-                        # team might be second column, maybe contains anchor
-                        team_cell = tr.find_all("td")[1]
-                        team_name = team_cell.get_text(" ", strip=True)
-                        played = int(tds[2]) if len(tds) > 2 and tds[2].isdigit() else 0
-                        wins = int(tds[3]) if len(tds) > 3 and tds[3].isdigit() else 0
-                        draws = int(tds[4]) if len(tds) > 4 and tds[4].isdigit() else 0
-                        losses = int(tds[5]) if len(tds) > 5 and tds[5].isdigit() else 0
-                        gf = int(tds[6]) if len(tds) > 6 and tds[6].isdigit() else 0
-                        ga = int(tds[7]) if len(tds) > 7 and tds[7].isdigit() else 0
-                        pts = int(tds[-1]) if tds[-1].isdigit() else 0
-                        standings.append({
-                            "position": pos,
-                            "team": team_name,
-                            "played": played,
-                            "wins": wins,
-                            "draws": draws,
-                            "losses": losses,
-                            "goals_for": gf,
-                            "goals_against": ga,
-                            "points": pts,
-                        })
-                    except Exception:
+                    pos = int(tds[0])
+                    # team is the second column, may contain an anchor
+                    team_name = tds[1]
+                    # one C-level scan over the numeric columns; the team cell
+                    # is skipped since club names can contain digits
+                    nums = list(map(int, _NUM_RE.findall(" ".join(tds[2:]))))
+                    if not nums:
                         continue
+                    played, wins, draws, losses, gf, ga = (nums + [0] * 6)[:6]
+                    pts = nums[-1]
+                    standings.append({
+                        "position": pos,
+                        "team": team_name,
+                        "played": played,
+                        "wins": wins,
+                        "draws": draws,
+                        "losses": losses,
+                        "goals_for": gf,
+                        "goals_against": ga,
+                        "points": pts,
+                    })
         return standings
 
     def parse_player_stats(self, soup):
@@ -231,31 +332,37 @@ class CompetitionScraper:
         stats = {}
         # Sections appear with headings 'Strijelci', 'Kartoni', 'Nastupi / minute'
         # Find headings with these texts
-        for heading_text in ("Strijelci", "Kartoni", "Nastupi / minute", "Strijelci, kartoni"):
-            heading = soup.find(lambda tag: tag.name in ("h2", "h3", "h4", "strong") and heading_text in tag.get_text())
+        for heading_text, heading_re in _STATS_HEADING_RES.items():
+            heading = None
+            for cand in soup.css("h2, h3, h4, strong"):
+                if heading_text in cand.text():
+                    heading = cand
+                    break
             if not heading:
                 # try any element containing the text
-                heading = soup.find(text=re.compile(heading_text))
-                if heading:
-                    heading = heading.parent
+                text_node = _find_text_node(soup.root, heading_re)
+                if text_node:
+                    heading = text_node.parent
             if not heading:
                 continue
             # players are typically in the following list elements
-            for sib in heading.find_next_siblings():
+            sib = heading.next
+            while sib is not None:
+                if sib.tag == "-text":
+                    sib = sib.next
+                    continue
                 # break if we encounter a new major section
-                if sib.name and sib.name.startswith("h"):
+                if sib.tag.startswith("h"):
                     break
                 # look for player blocks (anchored names and numeric columns)
                 # many player entries are like: <div> <img> <h3><a>Player Name</a></h3> <div>Igrač</div> [goals] [minutes] ...
-                player_anchors = sib.select("a")
-                for a in player_anchors:
-                    name = a.get_text(strip=True)
+                block_text = sib.text(separator=" ", strip=True)
+                # extract numbers in the block (goals, minutes etc) - heuristics
+                numbers = _NUM_RE.findall(block_text)
+                for a in sib.css("a"):
+                    name = a.text(strip=True)
                     if not name:
                         continue
-                    # parent block text
-                    block_text = sib.get_text(" ", strip=True)
-                    # extract numbers in the block (goals, minutes etc) - heuristics
-                    numbers = re.findall(r"\b\d+\b", block_text)
                     # assign heuristically: first number might be goals or appearances
                     goals = None
                     minutes = None
@@ -278,9 +385,5 @@ class CompetitionScraper:
                         "goals": goals if goals is not None else stats.get(name, {}).get("goals"),
                         "minutes": minutes if minutes is not None else stats.get(name, {}).get("minutes")
                     })
-                # if the sibling is a big list group and we've collected some players, stop further siblings
-                if stats:
-                    # continue scanning - but may want to limit
-                    pass
+                sib = sib.next
         return stats
-